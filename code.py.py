@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-import random
-from dataclasses import dataclass
-from typing import List, Set
+import numpy as np
+from numba import njit
+from dataclasses import dataclass, astuple
+from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Subject:
     name: str
     code: str
@@ -13,11 +14,21 @@ class Subject:
     is_lab: bool = False
     room: str = ""
 
-class TimeSlot:
-    def __init__(self, day: int, hour: int):
-        self.day = day
-        self.hour = hour
-        self.subject = None
+EMPTY = -1  # Marks a free cell in the slot grid
+
+class SubjectTable:
+    """Subject attributes as parallel int arrays indexed by subject id."""
+    def __init__(self, subjects: List[Subject]):
+        self.subjects = subjects
+        # Stable int ids for faculty and rooms; busy bitmasks are indexed by these
+        self.faculty_names = sorted({s.faculty for s in subjects})
+        self.room_names = sorted({s.room for s in subjects})
+        faculty_index = {name: i for i, name in enumerate(self.faculty_names)}
+        room_index = {name: i for i, name in enumerate(self.room_names)}
+        self.faculty_ids = np.array([faculty_index[s.faculty] for s in subjects], dtype=np.int16)
+        self.room_ids = np.array([room_index[s.room] for s in subjects], dtype=np.int16)
+        self.is_lab = np.array([s.is_lab for s in subjects], dtype=bool)
+        self.hours = np.array([s.hours_per_week for s in subjects], dtype=np.int16)
 
 class TimetableConfig:
     def __init__(
@@ -37,215 +48,307 @@ class TimetableConfig:
         self.branch = branch
         self.semester = semester
         self.year = year
+        if days_per_week * hours_per_day > 64:
+            raise ValueError("At most 64 slots per week are supported (busy slots are uint64 bitmasks)")
+
+        # Lunch hours and their slot bits, shared by every chromosome
+        lunch_end = lunch_break_start + lunch_break_duration
+        self.lunch_mask = np.array([lunch_break_start <= hour < lunch_end for hour in range(hours_per_day)], dtype=bool)
+        self.lunch_bits = np.uint64(sum(1 << (day * hours_per_day + hour)
+                                        for day in range(days_per_week)
+                                        for hour in range(hours_per_day)
+                                        if self.lunch_mask[hour]))
+        # Cells where a 3-hour lab fits before the end of the day
+        self.lab_start_bits = np.uint64(sum(1 << (day * hours_per_day + hour)
+                                            for day in range(days_per_week)
+                                            for hour in range(hours_per_day - 2)))
+        # day_prefix_bits[d] covers every slot of days before d, for day-wise crossover
+        self.day_prefix_bits = np.array([(1 << (day * hours_per_day)) - 1
+                                         for day in range(days_per_week + 1)], dtype=np.uint64)
+
+@njit(cache=True, boundscheck=False)
+def _is_slot_available(fac_busy, room_busy, faculty, room, blocked, mask):
+    # Check faculty, room and blocked-slot availability for every bit in mask
+    return ((fac_busy[faculty] | room_busy[room] | blocked) & mask) == 0
+
+@njit(cache=True, boundscheck=False)
+def _fill_schedule(slots, subj_hours, subj_is_lab, subj_faculty, subj_room,
+                   fac_busy, room_busy, blocked, lab_starts, draws):
+    # Every placement picks directly among the cells still free for the subject,
+    # so nothing is rejected and retried. blocked holds lunch hours plus cells
+    # already taken; draws[subject_id, k] are uniform in [0, 1), one per placement
+    hours = slots.shape[1]
+    n_cells = slots.size
+    candidates = np.empty(n_cells, dtype=np.int64)
+
+    for subject_id in range(subj_hours.size):
+        faculty = subj_faculty[subject_id]
+        room = subj_room[subject_id]
+        hours_left = subj_hours[subject_id]
+        placed = 0
+        while hours_left > 0:
+            free = ~(fac_busy[faculty] | room_busy[room] | blocked)
+            if subj_is_lab[subject_id] and hours_left >= 3:
+                # A 3-hour lab needs three consecutive free cells on one day
+                free &= (free >> np.uint64(1)) & (free >> np.uint64(2)) & lab_starts
+                width = 3
+            else:
+                width = 1
+
+            n_candidates = 0
+            for cell in range(n_cells):
+                if (free >> np.uint64(cell)) & np.uint64(1):
+                    candidates[n_candidates] = cell
+                    n_candidates += 1
+            if n_candidates == 0:
+                break  # No feasible slot left for this subject
+
+            cell = candidates[int(draws[subject_id, placed] * n_candidates)]
+            placed += 1
+            mask = ((np.uint64(1) << np.uint64(width)) - np.uint64(1)) << np.uint64(cell)
+            for h in range(width):
+                slots[cell // hours, cell % hours + h] = subject_id
+            fac_busy[faculty] |= mask
+            room_busy[room] |= mask
+            blocked |= mask
+            hours_left -= width
+
+@njit(cache=True, boundscheck=False)
+def _repair_schedule(slots, drawn, order, hours_left, subj_is_lab, subj_faculty, subj_room,
+                     fac_busy, room_busy, blocked):
+    # Keep each randomly drawn cell only where its subject still fits. Cells are
+    # visited in a random order so hours do not run out on the first days
+    days, hours = slots.shape
+    for cell in order:
+        bit = np.uint64(1) << np.uint64(cell)
+        if blocked & bit:
+            continue
+        day = cell // hours
+        hour = cell % hours
+        subject_id = drawn[cell]
+        faculty = subj_faculty[subject_id]
+        room = subj_room[subject_id]
+        # Labs with 3+ hours left need the whole 3-hour block here
+        width = 3 if subj_is_lab[subject_id] and hours_left[subject_id] >= 3 else 1
+        mask = ((np.uint64(1) << np.uint64(width)) - np.uint64(1)) << np.uint64(cell)
+        if (hours_left[subject_id] > 0 and hour + width <= hours and
+            _is_slot_available(fac_busy, room_busy, faculty, room, blocked, mask)):
+            for h in range(width):
+                slots[day, hour + h] = subject_id
+            fac_busy[faculty] |= mask
+            room_busy[room] |= mask
+            blocked |= mask
+            hours_left[subject_id] -= width
+    return blocked
+
+@njit(cache=True, boundscheck=False)
+def _seed_population(population_slots, drawn, order, subj_hours, subj_is_lab, subj_faculty, subj_room,
+                     fac_busy, room_busy, lunch, lab_starts, draws):
+    for i in range(population_slots.shape[0]):
+        hours_left = subj_hours.copy()
+        blocked = _repair_schedule(population_slots[i], drawn[i], order[i], hours_left, subj_is_lab,
+                                   subj_faculty, subj_room, fac_busy[i], room_busy[i], lunch)
+        # Top up whatever hours the random draw did not cover
+        _fill_schedule(population_slots[i], hours_left, subj_is_lab, subj_faculty, subj_room,
+                       fac_busy[i], room_busy[i], blocked, lab_starts, draws[i])
+
+@njit(cache=True, boundscheck=False)
+def _fitness_kernel(slots, subj_is_lab, lunch_mask, day_penalty):
+    # day_penalty[day] receives that day's lunch and lab penalties, which
+    # crossover children can inherit since they copy whole days. There is no
+    # faculty or room conflict term: a cell holds at most one subject, so two
+    # classes can never share a slot (the original checks always scored 0)
+    days, hours = slots.shape
+    for day in range(days):
+        day_penalty[day] = 0
+        for hour in range(hours):
+            subject_id = slots[day, hour]
+            if subject_id < 0:
+                continue
+
+            # Check for lunch break violations
+            if lunch_mask[hour]:
+                day_penalty[day] += 20  # Penalty for scheduling during lunch
+
+            # Check for lab hour continuity
+            if subj_is_lab[subject_id] and hour + 2 < hours:
+                if slots[day, hour + 1] != subject_id or slots[day, hour + 2] != subject_id:
+                    day_penalty[day] += 30  # Penalty for discontinuous lab sessions
+
+    return max(0, 100 - day_penalty.sum())
 
 class TimetableChromosome:
-    def __init__(self, config: TimetableConfig, subjects: List[Subject]):
+    def __init__(
+        self,
+        config: TimetableConfig,
+        table: SubjectTable,
+        slots: Optional[np.ndarray] = None,
+        faculty_busy: Optional[np.ndarray] = None,
+        room_busy: Optional[np.ndarray] = None
+    ):
         self.config = config
-        self.subjects = subjects
-        self.slots = self._initialize_slots()
+        self.table = table
+        self.slots = self._initialize_slots() if slots is None else slots
         self.fitness = 0
-        self.faculty_schedule = {}  # Track faculty schedules
-        self.room_schedule = {}     # Track room schedules
-        self._generate_random_schedule()
-
-    def _initialize_slots(self) -> List[List[TimeSlot]]:
-        return [[TimeSlot(day, hour) for hour in range(self.config.hours_per_day)]
-                for day in range(self.config.days_per_week)]
-
-    def _is_slot_available(self, day: int, hour: int, subject: Subject) -> bool:
-       
-        # Check faculty availability
-        if subject.faculty in self.faculty_schedule:
-            if (day, hour) in self.faculty_schedule[subject.faculty]:
-                return False
-
-        # Check room availability
-        if subject.room in self.room_schedule:
-            if (day, hour) in self.room_schedule[subject.room]:
-                return False
-
-        # Ensure lunch break timing doesn't overlap
-        if self.config.lunch_break_start <= hour < self.config.lunch_break_start + self.config.lunch_break_duration:
-            return False
-
-        return True
-
-    def _add_to_schedule(self, day: int, hour: int, subject: Subject):
-        # Add to faculty schedule
-        if subject.faculty not in self.faculty_schedule:
-            self.faculty_schedule[subject.faculty] = set()
-        self.faculty_schedule[subject.faculty].add((day, hour))
-
-        # Add to room schedule
-        if subject.room not in self.room_schedule:
-            self.room_schedule[subject.room] = set()
-        self.room_schedule[subject.room].add((day, hour))
-
-    def _generate_random_schedule(self):
-        
-        all_slots = [(day, hour)
-                     for day in range(self.config.days_per_week)
-                     for hour in range(self.config.hours_per_day)
-                     if not (hour >= self.config.lunch_break_start and 
-                            hour < self.config.lunch_break_start + self.config.lunch_break_duration)]
-
-        for subject in self.subjects:
-            hours_left = subject.hours_per_week
-            attempts = 0
-            max_attempts = 1000  # Prevent infinite loops
-            while hours_left > 0 and attempts < max_attempts:
-                attempts += 1
-                if subject.is_lab and hours_left >= 3:
-                    # Find a slot for a 3-hour lab
-                    day, hour = random.choice(all_slots)
-                    if (hour + 2 < self.config.hours_per_day and 
-                        self._is_slot_available(day, hour, subject) and
-                        self._is_slot_available(day, hour + 1, subject) and
-                        self._is_slot_available(day, hour + 2, subject)):
-                        for h in range(3):
-                            self.slots[day][hour + h].subject = subject
-                            self._add_to_schedule(day, hour + h, subject)
-                        hours_left -= 3
-                else:
-                    # Find a slot for a 1-hour class
-                    day, hour = random.choice(all_slots)
-                    if self._is_slot_available(day, hour, subject):
-                        self.slots[day][hour].subject = subject
-                        self._add_to_schedule(day, hour, subject)
-                        hours_left -= 1
+        self._fitness_dirty = True  # Set whenever slots change
+        # Lunch and lab penalty per day, or None when it must be recomputed
+        self.day_penalty = None
+        # Busy-slot bitmask per faculty/room id; bit day * hours_per_day + hour
+        if faculty_busy is None:
+            faculty_busy = np.zeros(len(table.faculty_names), dtype=np.uint64)
+        if room_busy is None:
+            room_busy = np.zeros(len(table.room_names), dtype=np.uint64)
+        self.faculty_busy = faculty_busy
+        self.room_busy = room_busy
+
+    @classmethod
+    def crossover(
+        cls, parent1: "TimetableChromosome", parent2: "TimetableChromosome", crossover_point: int
+    ) -> "TimetableChromosome":
+        # Days before crossover_point come from parent1, the rest from parent2
+        slots = np.empty_like(parent1.slots)
+        slots[:crossover_point] = parent1.slots[:crossover_point]
+        slots[crossover_point:] = parent2.slots[crossover_point:]
+
+        # Inherit busy bitmasks from the same side of the crossover as the slots
+        left = parent1.config.day_prefix_bits[crossover_point]
+        right = parent1.config.day_prefix_bits[-1] & ~left
+        faculty_busy = (parent1.faculty_busy & left) | (parent2.faculty_busy & right)
+        room_busy = (parent1.room_busy & left) | (parent2.room_busy & right)
+        child = cls(parent1.config, parent1.table, slots, faculty_busy, room_busy)
+
+        # Whole days are copied, so their per-day penalties carry over as well
+        if parent1.day_penalty is not None and parent2.day_penalty is not None:
+            child.day_penalty = np.concatenate(
+                (parent1.day_penalty[:crossover_point], parent2.day_penalty[crossover_point:])
+            )
+        return child
+
+    @classmethod
+    def random_population(
+        cls, config: TimetableConfig, table: SubjectTable, rng: np.random.Generator, size: int
+    ) -> List["TimetableChromosome"]:
+        if config.lunch_mask.all() or not table.subjects:
+            return [cls(config, table) for _ in range(size)]
+
+        # Draw a subject for every cell of every chromosome in one call, then
+        # repair: drop draws that clash or exceed a subject's weekly hours
+        n_cells = config.days_per_week * config.hours_per_day
+        drawn = rng.integers(0, len(table.subjects), size=(size, n_cells), dtype=np.int16)
+        order = rng.permuted(np.tile(np.arange(n_cells), (size, 1)), axis=1)
+        slots = np.full((size, config.days_per_week, config.hours_per_day), EMPTY, dtype=np.int16)
+        faculty_busy = np.zeros((size, len(table.faculty_names)), dtype=np.uint64)
+        room_busy = np.zeros((size, len(table.room_names)), dtype=np.uint64)
+        draws = rng.random(size=(size, len(table.subjects), int(table.hours.max())))
+        _seed_population(
+            slots, drawn, order, table.hours, table.is_lab, table.faculty_ids, table.room_ids,
+            faculty_busy, room_busy, config.lunch_bits, config.lab_start_bits, draws
+        )
+
+        return [cls(config, table, grid, faculty, room)
+                for grid, faculty, room in zip(slots, faculty_busy, room_busy)]
+
+    def _initialize_slots(self) -> np.ndarray:
+        # slots[day, hour] holds a subject id, or EMPTY
+        return np.full((self.config.days_per_week, self.config.hours_per_day), EMPTY, dtype=np.int16)
+
+    def _slot_bit(self, day: int, hour: int) -> np.uint64:
+        return np.uint64(1) << np.uint64(day * self.config.hours_per_day + hour)
 
     def calculate_fitness(self):
-        fitness = 100
-
-        # Check for faculty conflicts
-        faculty_slots = {}
-        for day in range(self.config.days_per_week):
-            for hour in range(self.config.hours_per_day):
-                slot = self.slots[day][hour]
-                if slot.subject:
-                    faculty = slot.subject.faculty
-                    if faculty not in faculty_slots:
-                        faculty_slots[faculty] = set()
-                    if (day, hour) in faculty_slots[faculty]:
-                        fitness -= 30  # High penalty for conflict
-                    faculty_slots[faculty].add((day, hour))
-
-        # Check for room conflicts
-        room_slots = {}
-        for day in range(self.config.days_per_week):
-            for hour in range(self.config.hours_per_day):
-                slot = self.slots[day][hour]
-                if slot.subject:
-                    room = slot.subject.room
-                    if room not in room_slots:
-                        room_slots[room] = set()
-                    if (day, hour) in room_slots[room]:
-                        fitness -= 30  # High penalty for conflict
-                    room_slots[room].add((day, hour))
-
-        # Check for lunch break violations
-        for day in range(self.config.days_per_week):
-            for hour in range(self.config.lunch_break_start, 
-                            self.config.lunch_break_start + self.config.lunch_break_duration):
-                if self.slots[day][hour].subject:
-                    fitness -= 20  # Penalty for scheduling during lunch
-
-        # Check for lab hour continuity
-        for day in range(self.config.days_per_week):
-            for hour in range(self.config.hours_per_day - 2):
-                slot = self.slots[day][hour]
-                if slot.subject and slot.subject.is_lab:
-                    if (not self.slots[day][hour + 1].subject or 
-                        not self.slots[day][hour + 2].subject or
-                        self.slots[day][hour + 1].subject != slot.subject or
-                        self.slots[day][hour + 2].subject != slot.subject):
-                        fitness -= 30  # Penalty for discontinuous lab sessions
-
-        self.fitness = max(0, fitness)
+        # Survivors carried over unchanged keep their previous score
+        if not self._fitness_dirty:
+            return self.fitness
+        self._fitness_dirty = False
+        if self.day_penalty is not None:
+            # Inherited per-day penalties already cover the whole grid
+            self.fitness = max(0, 100 - int(self.day_penalty.sum()))
+            return self.fitness
+        self.day_penalty = np.empty(self.config.days_per_week, dtype=np.int32)
+        self.fitness = _fitness_kernel(self.slots, self.table.is_lab, self.config.lunch_mask, self.day_penalty)
         return self.fitness
 
-def generate_timetable(config: TimetableConfig, subjects: List[Subject]) -> TimetableChromosome:
+def generate_timetable(config: TimetableConfig, subjects: List[Subject], seed: Optional[int] = None) -> TimetableChromosome:
     population_size = 50
     generations = 100
     mutation_rate = 0.1
+    patience = 15  # Generations without improvement before giving up
+
+    n_parents = population_size // 2
+    n_offspring = population_size - n_parents
+
+    table = SubjectTable(subjects)
+    rng = np.random.default_rng(seed)
 
     # Initialize population
-    population = [TimetableChromosome(config, subjects) for _ in range(population_size)]
+    population = TimetableChromosome.random_population(config, table, rng, population_size)
+    fitnesses = np.empty(population_size, dtype=np.int32)
+    best_so_far, stagnation = -1, 0
 
     for generation in range(generations):
         # Calculate fitness for all chromosomes
-        for chromosome in population:
-            chromosome.calculate_fitness()
-
-        # Sort population by fitness (higher is better)
-        population.sort(key=lambda x: x.fitness, reverse=True)
+        fitnesses[:] = [chromosome.calculate_fitness() for chromosome in population]
 
         # If perfect fitness is achieved, stop early
-        if population[0].fitness == 100:
+        if fitnesses.max() == 100:
             break
 
-        # Select the top 50% as parents
-        parents = population[:population_size // 2]
+        # Stop early once the best fitness has plateaued
+        if fitnesses.max() > best_so_far:
+            best_so_far, stagnation = fitnesses.max(), 0
+        else:
+            stagnation += 1
+            if stagnation >= patience:
+                break
+
+        # Select the top 50% as parents; the stable sort keeps survivors
+        # ahead of offspring with the same fitness
+        top = np.argsort(-fitnesses, kind="stable")[:n_parents]
+        parents = [population[i] for i in top]
+
+        # Draw every parent pair and crossover point for this generation at once;
+        # the second index skips over the first so the two parents always differ
+        first = rng.integers(0, n_parents, size=n_offspring)
+        second = rng.integers(0, n_parents - 1, size=n_offspring)
+        second += second >= first
+        crossover_points = rng.integers(1, config.days_per_week, size=n_offspring)
 
         # Create offspring through crossover
         offspring = []
-        while len(offspring) < population_size - len(parents):
-            parent1, parent2 = random.sample(parents, 2)
-            child = TimetableChromosome(config, subjects)
-
+        for i1, i2, crossover_point in zip(first, second, crossover_points):
             # Perform crossover: take a random subset of days from each parent
-            crossover_point = random.randint(1, config.days_per_week - 1)
-            for day in range(config.days_per_week):
-                for hour in range(config.hours_per_day):
-                    if day < crossover_point:
-                        child.slots[day][hour].subject = parent1.slots[day][hour].subject
-                    else:
-                        child.slots[day][hour].subject = parent2.slots[day][hour].subject
-
-            # Recalculate schedules based on crossover
-            child.faculty_schedule = {}
-            child.room_schedule = {}
-            for day in range(config.days_per_week):
-                for hour in range(config.hours_per_day):
-                    slot = child.slots[day][hour]
-                    if slot.subject:
-                        child._add_to_schedule(day, hour, slot.subject)
+            child = TimetableChromosome.crossover(parents[i1], parents[i2], crossover_point)
 
             # Mutation: swap two random slots
-            if random.random() < mutation_rate:
-                day1, hour1 = random.randint(0, config.days_per_week - 1), random.randint(0, config.hours_per_day - 1)
-                day2, hour2 = random.randint(0, config.days_per_week - 1), random.randint(0, config.hours_per_day - 1)
-                slot1 = child.slots[day1][hour1].subject
-                slot2 = child.slots[day2][hour2].subject
+            if rng.random() < mutation_rate:
+                day1, hour1, day2, hour2 = rng.integers(
+                    0, [config.days_per_week, config.hours_per_day, config.days_per_week, config.hours_per_day]
+                )
+                id1 = child.slots[day1, hour1]
+                id2 = child.slots[day2, hour2]
 
                 # Swap subjects if possible
-                if slot1 is not None and slot2 is not None:
+                if id1 != EMPTY and id2 != EMPTY:
+                    bit1 = child._slot_bit(day1, hour1)
+                    bit2 = child._slot_bit(day2, hour2)
+                    faculty1, room1 = table.faculty_ids[id1], table.room_ids[id1]
+                    faculty2, room2 = table.faculty_ids[id2], table.room_ids[id2]
                     # Check if swapping causes any conflicts
-                    can_swap = True
-                    # Check faculty and room for slot1 in new position
-                    if slot1.faculty in child.faculty_schedule and (day2, hour2) in child.faculty_schedule[slot1.faculty]:
-                        can_swap = False
-                    if slot1.room in child.room_schedule and (day2, hour2) in child.room_schedule[slot1.room]:
-                        can_swap = False
-                    # Similarly for slot2
-                    if slot2.faculty in child.faculty_schedule and (day1, hour1) in child.faculty_schedule[slot2.faculty]:
-                        can_swap = False
-                    if slot2.room in child.room_schedule and (day1, hour1) in child.room_schedule[slot2.room]:
-                        can_swap = False
+                    can_swap = not (
+                        (child.faculty_busy[faculty1] | child.room_busy[room1]) & bit2 or
+                        (child.faculty_busy[faculty2] | child.room_busy[room2]) & bit1
+                    )
 
                     if can_swap:
-                        child.slots[day1][hour1].subject, child.slots[day2][hour2].subject = slot2, slot1
+                        child.slots[day1, hour1], child.slots[day2, hour2] = id2, id1
+                        child._fitness_dirty = True
+                        child.day_penalty = None
 
-                        # Update schedules
-                        child.faculty_schedule[slot1.faculty].remove((day1, hour1))
-                        child.room_schedule[slot1.room].remove((day1, hour1))
-                        child.faculty_schedule[slot1.faculty].add((day2, hour2))
-                        child.room_schedule[slot1.room].add((day2, hour2))
-
-                        child.faculty_schedule[slot2.faculty].remove((day2, hour2))
-                        child.room_schedule[slot2.room].remove((day2, hour2))
-                        child.faculty_schedule[slot2.faculty].add((day1, hour1))
-                        child.room_schedule[slot2.room].add((day1, hour1))
+                        # Update schedules: move each subject's bit to its new slot
+                        child.faculty_busy[faculty1] ^= bit1 | bit2
+                        child.room_busy[room1] ^= bit1 | bit2
+                        child.faculty_busy[faculty2] ^= bit1 | bit2
+                        child.room_busy[room2] ^= bit1 | bit2
 
             offspring.append(child)
 
@@ -256,6 +359,38 @@ def generate_timetable(config: TimetableConfig, subjects: List[Subject]) -> Time
     best_timetable = max(population, key=lambda x: x.fitness)
     return best_timetable
 
+def subject_rows(subjects: List[Subject]) -> tuple:
+    # Hashable snapshot of the subjects, used as the cache key below
+    return tuple(astuple(s) for s in subjects)
+
+@st.cache_data
+def build_subjects_df(rows: tuple) -> pd.DataFrame:
+    subjects = [Subject(*row) for row in rows]
+    return pd.DataFrame([
+        {
+            "Subject": s.name,
+            "Code": s.code,
+            "Faculty": s.faculty,
+            "Hours": s.hours_per_week,
+            "Type": "Lab" if s.is_lab else "Theory",
+            "Room": s.room
+        }
+        for s in subjects
+    ])
+
+@st.cache_data
+def build_faculty_df(rows: tuple) -> pd.DataFrame:
+    subjects = [Subject(*row) for row in rows]
+    return pd.DataFrame([
+        {
+            "Faculty Name": s.faculty,
+            "Subject": s.name,
+            "Subject Code": s.code,
+            "Room": s.room
+        }
+        for s in subjects
+    ])
+
 def main():
     st.title("Automated Timetable Generator")
 
@@ -306,17 +441,7 @@ def main():
     # Display added subjects
     if st.session_state.subjects:
         st.header("Added Subjects")
-        subjects_df = pd.DataFrame([
-            {
-                "Subject": s.name,
-                "Code": s.code,
-                "Faculty": s.faculty,
-                "Hours": s.hours_per_week,
-                "Type": "Lab" if s.is_lab else "Theory",
-                "Room": s.room
-            }
-            for s in st.session_state.subjects
-        ])
+        subjects_df = build_subjects_df(subject_rows(st.session_state.subjects))
         st.table(subjects_df)
 
     # Generate timetable button
@@ -352,11 +477,12 @@ def main():
         for hour in range(config.hours_per_day):
             row = [time_slots[hour]]
             for day in range(config.days_per_week):
-                slot = timetable.slots[day][hour]
-                if config.lunch_break_start <= hour < config.lunch_break_start + config.lunch_break_duration:
+                subject_id = timetable.slots[day, hour]
+                if config.lunch_mask[hour]:
                     cell = "**Lunch**"
-                elif slot.subject:
-                    cell = f"{slot.subject.name}\n({slot.subject.code})\n{slot.subject.faculty}\n{slot.subject.room}"
+                elif subject_id != EMPTY:
+                    subject = timetable.table.subjects[subject_id]
+                    cell = f"{subject.name}\n({subject.code})\n{subject.faculty}\n{subject.room}"
                 else:
                     cell = "-"
                 row.append(cell)
@@ -367,15 +493,7 @@ def main():
 
         # Display faculty details
         st.header("Faculty Details")
-        faculty_df = pd.DataFrame([
-            {
-                "Faculty Name": s.faculty,
-                "Subject": s.name,
-                "Subject Code": s.code,
-                "Room": s.room
-            }
-            for s in st.session_state.subjects
-        ])
+        faculty_df = build_faculty_df(subject_rows(st.session_state.subjects))
         st.table(faculty_df)
 
     # Option to reset subjects